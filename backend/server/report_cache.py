@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields of a research request that determine the generated report, headers included
+# since they can carry per-request config overrides
+CACHE_KEY_FIELDS = ("task", "report_type", "report_source", "tone", "language", "headers")
+
+
+class ReportCache:
+    """In-process cache for generated reports.
+
+    Lookups first try an exact match on a hash of the request, then optionally
+    fall back to a semantic match on the task text. The semantic layer is only
+    enabled when REPORT_CACHE_SIMILARITY_THRESHOLD is set, since templated
+    prompts (e.g. /generate-summary) can embed very closely for different inputs.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+        similarity_threshold: float | None = None,
+    ):
+        self.ttl = ttl if ttl is not None else float(os.getenv("REPORT_CACHE_TTL", 24 * 60 * 60))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("REPORT_CACHE_MAX_ENTRIES", 128))
+        if similarity_threshold is None and os.getenv("REPORT_CACHE_SIMILARITY_THRESHOLD"):
+            similarity_threshold = float(os.environ["REPORT_CACHE_SIMILARITY_THRESHOLD"])
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._embeddings = None
+
+    @staticmethod
+    def cache_key(research_request) -> str:
+        payload = {field: getattr(research_request, field, None) for field in CACHE_KEY_FIELDS}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _scope(research_request) -> tuple:
+        """Everything except the task must match for a semantic hit."""
+        return tuple(getattr(research_request, field, None) for field in CACHE_KEY_FIELDS[1:])
+
+    async def get(self, research_request, research_id: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response re-issued under research_id, or None on a miss."""
+        self._evict_expired()
+        key = self.cache_key(research_request)
+        entry = self._entries.get(key)
+
+        if entry is None and self.similarity_threshold is not None:
+            entry = await self._semantic_lookup(research_request)
+
+        if entry is None:
+            return None
+
+        response = await self._materialize(entry["response"], research_id)
+        if response is None:
+            # Artifacts are gone from disk, the entry is no longer usable
+            self._entries.pop(entry["key"], None)
+            return None
+
+        # A concurrent set() may have evicted the entry while its files were copied
+        if entry["key"] in self._entries:
+            self._entries.move_to_end(entry["key"])
+        logger.info(f"Report cache hit for research_id {research_id}")
+        return response
+
+    async def set(self, research_request, response: Dict[str, Any]) -> None:
+        if not response.get("report"):
+            return
+
+        key = self.cache_key(research_request)
+        entry = {
+            "key": key,
+            "scope": self._scope(research_request),
+            "response": response,
+            "expires_at": time.monotonic() + self.ttl,
+            "embedding": None,
+        }
+        if self.similarity_threshold is not None:
+            entry["embedding"] = await self._embed(research_request.task)
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _semantic_lookup(self, research_request) -> Optional[Dict[str, Any]]:
+        query_embedding = await self._embed(research_request.task)
+        if query_embedding is None:
+            return None
+
+        scope = self._scope(research_request)
+        best_entry, best_score = None, self.similarity_threshold
+        for entry in self._entries.values():
+            if entry["scope"] != scope or entry["embedding"] is None:
+                continue
+            score = _cosine_similarity(query_embedding, entry["embedding"])
+            if score >= best_score:
+                best_entry, best_score = entry, score
+        return best_entry
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        try:
+            if self._embeddings is None:
+                from gpt_researcher.config.config import Config
+                from gpt_researcher.memory import Memory
+
+                cfg = Config()
+                self._embeddings = Memory(
+                    cfg.embedding_provider,
+                    cfg.embedding_model,
+                    **cfg.embedding_kwargs
+                ).get_embeddings()
+            return await self._embeddings.aembed_query(text)
+        except Exception as e:
+            logger.warning(f"Report cache embedding failed, skipping semantic lookup: {e}")
+            return None
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry["expires_at"] <= now]:
+            del self._entries[key]
+
+    @staticmethod
+    async def _materialize(response: Dict[str, Any], research_id: str) -> Optional[Dict[str, Any]]:
+        """Re-issue a cached response under research_id, copying its docx/pdf files.
+
+        The response is marked as cached and reports no research costs, since nothing was spent.
+        """
+        response = {**response, "research_id": research_id, "cached": True}
+        if "research_information" in response:
+            response["research_information"] = {**response["research_information"], "research_costs": 0.0}
+
+        for field, extension in (("docx_path", "docx"), ("pdf_path", "pdf")):
+            cached_path = response.get(field)
+            if not cached_path:
+                continue
+            source = urllib.parse.unquote(cached_path)
+            if not os.path.exists(source):
+                return None
+            target = f"outputs/{research_id[:60]}.{extension}"
+            if os.path.abspath(source) != os.path.abspath(target):
+                await asyncio.to_thread(shutil.copyfile, source, target)
+            response[field] = urllib.parse.quote(target)
+        return response
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
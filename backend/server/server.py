@@ -3,24 +3,29 @@ import os
 from typing import Dict, List
 import time
 import asyncio
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, File, UploadFile, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
 from backend.server.websocket_manager import WebSocketManager
+from backend.server.report_cache import ReportCache
+from backend.server.task_queue import queue_enabled, enqueue_report, get_report_status, close_pool
 from backend.server.server_utils import (
     get_config_dict, sanitize_filename,
     update_environment_variables, handle_file_upload, handle_file_deletion,
-    execute_multi_agents, handle_websocket_communication
+    execute_multi_agents, handle_websocket_communication, CustomLogsHandler, etag_matches
 )
 
 from backend.server.websocket_manager import run_agent
-from backend.utils import write_md_to_word, write_md_to_pdf
+from backend.utils import write_md_to_word, write_md_to_pdf, set_render_executor, create_render_pool
+from gpt_researcher import GPTResearcher
+from gpt_researcher.config.config import Config
 from gpt_researcher.utils.logging_config import setup_research_logging
 from gpt_researcher.utils.enum import Tone
 from backend.chat.chat import ChatAgentWithMemory
@@ -82,6 +87,46 @@ class SummaryRequest(BaseModel):
     publication_date: str
 
 
+# Prompt templates for /generate-summary, filled in per request
+_CHINESE_TEMPLATE = (
+    "请用中文帮我开展一次深度研究，帮助我快速、全面、深入地理解以下这本书：\n\n"
+    "书名：{name}\n"
+    "作者：{author}\n"
+    "出版时间：{publication_date}\n\n"
+    "请**仅使用英文资料**进行搜索和信息采集，但全部用**中文撰写报告**。\n\n"
+    "请围绕以下维度进行详细分析（不限于此）：\n"
+    "- 引言\n"
+    "- 内容结构\n"
+    "- 核心观点\n"
+    "- 目标读者/适用人群\n"
+    "- 现实意义或社会影响\n"
+    "- 与其他类似书籍的比较与差异\n"
+    "- **逐章深度解读（每一章分别详细介绍其核心内容、关键情节和观点，如有章节标题也请注明）**\n"
+    "- 结论\n"
+    "报告应尽量详尽，篇幅尽可能长一些，务求深刻与全面，不需总结简略，请详细解读。\n\n"
+    "请注意：**正文中不要插入任何超链接或网页链接**，如需引用资料，请统一列在报告末尾的“参考资料”部分。"
+)
+
+_ENGLISH_TEMPLATE = (
+    "Please conduct an in-depth research to help me fully understand the following book:\n\n"
+    "Title: {name}\n"
+    "Author: {author}\n"
+    "Publication Date: {publication_date}\n\n"
+    "Use only English sources for research, and write the entire report in **English**.\n\n"
+    "Please cover the following aspects in detail (but not limited to these):\n"
+    "- Introduction\n"
+    "- Structure of the content\n"
+    "- Core ideas and arguments\n"
+    "- Target audience\n"
+    "- Real-world significance or societal impact\n"
+    "- Comparisons with similar books\n"
+    "- **Chapter-by-chapter deep dive (introduce the main content, key plots, and ideas of each chapter, mentioning chapter titles if available)**\n"
+    "- Conclusion\n"
+    "The report should be as detailed as possible, with no word limit. Avoid brief summaries — aim for depth and comprehensiveness.\n\n"
+    "**Do not insert any hyperlinks or URLs in the body**. If citing sources, list them at the end under 'References'."
+)
+
+
 # App initialization
 app = FastAPI()
 
@@ -93,6 +138,9 @@ templates = Jinja2Templates(directory="./frontend")
 # WebSocket manager
 manager = WebSocketManager()
 
+# Cache of generated reports, keyed by research request
+report_cache = ReportCache()
+
 # Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -105,6 +153,13 @@ app.add_middleware(
 # Constants
 DOC_PATH = os.getenv("DOC_PATH", "./my-docs")
 base_url = os.getenv("BASE_URL")
+REPORT_CACHE_MAX_AGE = 3600
+
+
+@lru_cache(maxsize=1)
+def _get_cfg() -> Config:
+    """Default config, loaded once per process."""
+    return Config()
 
 # Startup event
 
@@ -113,9 +168,17 @@ base_url = os.getenv("BASE_URL")
 def startup_event():
     os.makedirs("outputs", exist_ok=True)
     app.mount("/outputs", StaticFiles(directory="outputs"), name="outputs")
+    # Render docx/pdf files in worker processes so they don't hold the GIL of the API process
+    set_render_executor(create_render_pool)
     # os.makedirs(DOC_PATH, exist_ok=True)  # Commented out to avoid creating the folder if not needed
     
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_pool()
+    set_render_executor(None)
+
+
 # Routes
 
 
@@ -127,15 +190,34 @@ async def read_root(request: Request):
 @app.get("/report/{research_id}")
 async def read_report(request: Request, research_id: str):
     docx_path = os.path.join('outputs', f"{research_id}.docx")
-    if not os.path.exists(docx_path):
+    try:
+        stat_result = os.stat(docx_path)
+    except FileNotFoundError:
         return {"message": "Report not found."}
-    return FileResponse(docx_path)
+
+    headers = {
+        "Cache-Control": f"public, max-age={REPORT_CACHE_MAX_AGE}",
+        "ETag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+    }
+    # Let polling clients revalidate without downloading the report again
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(docx_path, headers=headers, stat_result=stat_result)
+
+
+@app.get("/report/{research_id}/status")
+async def read_report_status(research_id: str):
+    if not queue_enabled():
+        return JSONResponse(status_code=404, content={"message": "Report queue is not enabled."})
+    return {"research_id": research_id, "status": await get_report_status(research_id)}
 
 
 async def write_report(research_request: ResearchRequest, research_id: str = None):
-    from gpt_researcher.config.config import Config
+    cached_response = await report_cache.get(research_request, research_id)
+    if cached_response is not None:
+        return cached_response
 
-    cfg = Config()
+    cfg = _get_cfg()
 
     report_information = await run_agent(
         task=research_request.task,
@@ -153,26 +235,86 @@ async def write_report(research_request: ResearchRequest, research_id: str = Non
         language=cfg.language
     )
 
-    docx_path = await write_md_to_word(report_information[0], research_id)
-    pdf_path = await write_md_to_pdf(report_information[0], research_id)
     if research_request.report_type != "multi_agents":
         report, researcher = report_information
-        response = {
-            "research_id": research_id,
-            "research_information": {
-                "source_urls": researcher.get_source_urls(),
-                "research_costs": researcher.get_costs(),
-                "visited_urls": list(researcher.visited_urls),
-                "research_images": researcher.get_research_images(),
-                # "research_sources": researcher.get_research_sources(),  # Raw content of sources may be very large
-            },
-            "report": report,
-            "docx_path": docx_path,
-            "pdf_path": pdf_path
-        }
     else:
-        response = { "research_id": research_id, "report": "", "docx_path": docx_path, "pdf_path": pdf_path }
+        report, researcher = report_information, None
+
+    response = await build_report_response(report, researcher, research_id)
+    await report_cache.set(research_request, response)
+    return response
 
+
+async def build_report_response(report: str, researcher, research_id: str) -> dict:
+    docx_path, pdf_path = await asyncio.gather(
+        write_md_to_word(report, research_id),
+        write_md_to_pdf(report, research_id)
+    )
+    if researcher is None:
+        return { "research_id": research_id, "report": "", "docx_path": docx_path, "pdf_path": pdf_path }
+
+    return {
+        "research_id": research_id,
+        "research_information": {
+            "source_urls": researcher.get_source_urls(),
+            "research_costs": researcher.get_costs(),
+            "visited_urls": list(researcher.visited_urls),
+            "research_images": researcher.get_research_images(),
+            # "research_sources": researcher.get_research_sources(),  # Raw content of sources may be very large
+        },
+        "report": report,
+        "docx_path": docx_path,
+        "pdf_path": pdf_path
+    }
+
+
+def _researcher_kwargs(research_request: ResearchRequest, logs_handler: CustomLogsHandler) -> dict:
+    return {
+        "query": research_request.task,
+        "report_type": research_request.report_type,
+        "report_source": research_request.report_source,
+        "tone": Tone[research_request.tone],
+        "websocket": logs_handler,
+        "headers": research_request.headers,
+    }
+
+
+async def conduct_shared_research(research_request: ResearchRequest) -> GPTResearcher:
+    """Run the research phase once so several reports can be written from its context."""
+    logs_handler = CustomLogsHandler(None, research_request.task)
+    researcher = GPTResearcher(**_researcher_kwargs(research_request, logs_handler))
+    await researcher.conduct_research()
+    return researcher
+
+
+async def write_report_from_research(
+    research_request: ResearchRequest,
+    research_id: str,
+    shared_researcher: GPTResearcher,
+    include_research_costs: bool = False,
+) -> dict:
+    """Write a report for research_request reusing the context gathered by shared_researcher.
+
+    The cost of the shared research is only added when include_research_costs is set, so
+    it is reported once across all the reports written from it. Callers check the report
+    cache first.
+    """
+    # Log the write-up to the same file as the shared research
+    researcher = GPTResearcher(
+        **_researcher_kwargs(research_request, shared_researcher.websocket),
+        agent=shared_researcher.agent,
+        role=shared_researcher.role,
+        context=shared_researcher.context,
+        visited_urls=set(shared_researcher.visited_urls),
+    )
+    researcher.research_sources = shared_researcher.research_sources
+    researcher.research_images = shared_researcher.research_images
+    if include_research_costs:
+        researcher.add_costs(shared_researcher.get_costs())
+
+    report = await researcher.write_report()
+    response = await build_report_response(report, researcher, research_id)
+    await report_cache.set(research_request, response)
     return response
 
 @app.post("/report/")
@@ -180,7 +322,10 @@ async def generate_report(research_request: ResearchRequest, background_tasks: B
     research_id = sanitize_filename(f"task_{int(time.time())}_{research_request.task}")
 
     if research_request.generate_in_background:
-        background_tasks.add_task(write_report, research_request=research_request, research_id=research_id)
+        if queue_enabled():
+            await enqueue_report(research_request.model_dump(), research_id)
+        else:
+            background_tasks.add_task(write_report, research_request=research_request, research_id=research_id)
         return {"message": "Your report is being generated in the background. Please check back later.",
                 "research_id": research_id}
     else:
@@ -190,10 +335,12 @@ async def generate_report(research_request: ResearchRequest, background_tasks: B
 
 @app.get("/files/")
 async def list_files():
-    if not os.path.exists(DOC_PATH):
+    try:
+        with os.scandir(DOC_PATH) as entries:
+            files = [entry.name for entry in entries]
+    except FileNotFoundError:
         os.makedirs(DOC_PATH, exist_ok=True)
-    files = os.listdir(DOC_PATH)
-    print(f"Files in {DOC_PATH}: {files}")
+        files = []
     return {"files": files}
 
 
@@ -214,52 +361,17 @@ async def delete_file(filename: str):
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        await handle_websocket_communication(websocket, manager)
-    except WebSocketDisconnect:
-        await manager.disconnect(websocket)
+    async with manager.connection(websocket):
+        try:
+            await handle_websocket_communication(websocket, manager)
+        except WebSocketDisconnect:
+            pass
 
 @app.post("/generate-summary")
 async def generate_summary(request: SummaryRequest):
     try:
-        chinese_task = (
-            f"请用中文帮我开展一次深度研究，帮助我快速、全面、深入地理解以下这本书：\n\n"
-            f"书名：{request.name}\n"
-            f"作者：{request.author}\n"
-            f"出版时间：{request.publication_date}\n\n"
-            f"请**仅使用英文资料**进行搜索和信息采集，但全部用**中文撰写报告**。\n\n"
-            f"请围绕以下维度进行详细分析（不限于此）：\n"
-            f"- 引言\n"
-            f"- 内容结构\n"
-            f"- 核心观点\n"
-            f"- 目标读者/适用人群\n"
-            f"- 现实意义或社会影响\n"
-            f"- 与其他类似书籍的比较与差异\n"
-            f"- **逐章深度解读（每一章分别详细介绍其核心内容、关键情节和观点，如有章节标题也请注明）**\n"
-            f"- 结论\n"
-            f"报告应尽量详尽，篇幅尽可能长一些，务求深刻与全面，不需总结简略，请详细解读。\n\n"
-            f"请注意：**正文中不要插入任何超链接或网页链接**，如需引用资料，请统一列在报告末尾的“参考资料”部分。"
-        )
-
-        english_task = (
-            f"Please conduct an in-depth research to help me fully understand the following book:\n\n"
-            f"Title: {request.name}\n"
-            f"Author: {request.author}\n"
-            f"Publication Date: {request.publication_date}\n\n"
-            f"Use only English sources for research, and write the entire report in **English**.\n\n"
-            f"Please cover the following aspects in detail (but not limited to these):\n"
-            f"- Introduction\n"
-            f"- Structure of the content\n"
-            f"- Core ideas and arguments\n"
-            f"- Target audience\n"
-            f"- Real-world significance or societal impact\n"
-            f"- Comparisons with similar books\n"
-            f"- **Chapter-by-chapter deep dive (introduce the main content, key plots, and ideas of each chapter, mentioning chapter titles if available)**\n"
-            f"- Conclusion\n"
-            f"The report should be as detailed as possible, with no word limit. Avoid brief summaries — aim for depth and comprehensiveness.\n\n"
-            f"**Do not insert any hyperlinks or URLs in the body**. If citing sources, list them at the end under 'References'."
-        )
+        chinese_task = _CHINESE_TEMPLATE.format(**request.model_dump())
+        english_task = _ENGLISH_TEMPLATE.format(**request.model_dump())
 
         chinese_request = ResearchRequest(
             task=chinese_task,
@@ -287,10 +399,32 @@ async def generate_summary(request: SummaryRequest):
         chinese_id = sanitize_filename(f"summary_cn_{int(time.time())}_{request.name[:20]}")
         english_id = sanitize_filename(f"summary_en_{int(time.time())}_{request.name[:20]}")
 
-        chinese_result, english_result = await asyncio.gather(
-            write_report(chinese_request, research_id=chinese_id),
-            write_report(english_request, research_id=english_id)
-        )
+        # Both reports are researched from English sources, so crawl once and
+        # only split at the writing step
+        chinese_result = await report_cache.get(chinese_request, chinese_id)
+        english_result = await report_cache.get(english_request, english_id)
+        if chinese_result is None or english_result is None:
+            shared_researcher = await conduct_shared_research(english_request)
+
+            async def reuse_or_write(result, research_request, research_id, include_research_costs):
+                if result is not None:
+                    return result
+                return await write_report_from_research(
+                    research_request, research_id, shared_researcher, include_research_costs
+                )
+
+            # Only write the reports that missed the cache, charging the shared research to
+            # the English report unless it was cached
+            chinese_result, english_result = await asyncio.gather(
+                reuse_or_write(
+                    chinese_result, chinese_request, chinese_id,
+                    include_research_costs=english_result is not None
+                ),
+                reuse_or_write(
+                    english_result, english_request, english_id,
+                    include_research_costs=english_result is None
+                )
+            )
 
         return {
             "summary_chinese": chinese_result.get("report", "No Chinese report returned"),
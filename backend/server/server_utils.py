@@ -9,6 +9,8 @@ from typing import Awaitable, Dict, List, Any
 from fastapi.responses import JSONResponse, FileResponse
 from gpt_researcher.document.document import DocumentLoader
 from gpt_researcher import GPTResearcher
+from gpt_researcher.actions import stream_output
+from multi_agents.main import run_research_task
 from backend.utils import write_md_to_pdf, write_md_to_word, write_text_to_md
 from pathlib import Path
 from datetime import datetime
@@ -18,6 +20,9 @@ import logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Seconds without messages before an idle websocket is closed
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", 600))
+
 class CustomLogsHandler:
     """Custom handler to capture streaming logs from the research process"""
     def __init__(self, websocket, task: str):
@@ -245,6 +250,18 @@ async def handle_file_upload(file, DOC_PATH: str) -> Dict[str, str]:
     return {"filename": file.filename, "path": file_path}
 
 
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against etag, per RFC 9110."""
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque_tag:
+            return True
+    return False
+
+
 async def handle_file_deletion(filename: str, DOC_PATH: str) -> JSONResponse:
     file_path = os.path.join(DOC_PATH, os.path.basename(filename))
     if os.path.exists(file_path):
@@ -257,7 +274,8 @@ async def handle_file_deletion(filename: str, DOC_PATH: str) -> JSONResponse:
 
 
 async def execute_multi_agents(manager) -> Any:
-    websocket = manager.active_connections[0] if manager.active_connections else None
+    # Stream to the oldest open connection
+    websocket = next(iter(manager.active_connections), None)
     if websocket:
         report = await run_research_task("Is AI in a hype cycle?", websocket, stream_output)
         return {"report": report}
@@ -290,7 +308,15 @@ async def handle_websocket_communication(websocket, manager):
     try:
         while True:
             try:
-                data = await websocket.receive_text()
+                try:
+                    async with asyncio.timeout(WS_IDLE_TIMEOUT):
+                        data = await websocket.receive_text()
+                except TimeoutError:
+                    if running_task and not running_task.done():
+                        # Clients may stay silent while their research is running
+                        continue
+                    logger.info("Closing idle WebSocket connection.")
+                    break
                 
                 if data == "ping":
                     await websocket.send_text("pong")
@@ -0,0 +1,70 @@
+import logging
+import os
+
+try:
+    from arq import create_pool
+    from arq.connections import RedisSettings
+    from arq.jobs import Job
+    HAS_ARQ = True
+except ImportError:
+    HAS_ARQ = False
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+# Seconds a worker lets a queued report run before cancelling it
+REPORT_JOB_TIMEOUT = int(os.getenv("REPORT_JOB_TIMEOUT", 60 * 60))
+
+if REDIS_URL and not HAS_ARQ:
+    logger.warning(
+        "REDIS_URL is set but arq is not installed, background reports will run in-process. "
+        "Install the queue extra with: pip install 'gpt-researcher[queue]'"
+    )
+
+_pool = None
+
+
+def queue_enabled() -> bool:
+    """Background reports go through the Redis queue only when arq is installed and REDIS_URL is set."""
+    return HAS_ARQ and bool(REDIS_URL)
+
+
+async def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = await create_pool(RedisSettings.from_dsn(REDIS_URL))
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def enqueue_report(research_request: dict, research_id: str) -> None:
+    """Enqueue a report for a worker, using research_id as the job id."""
+    pool = await get_pool()
+    await pool.enqueue_job("write_report_task", research_request, research_id, _job_id=research_id)
+    logger.info(f"Enqueued report {research_id}")
+
+
+async def get_report_status(research_id: str) -> str:
+    job = Job(research_id, await get_pool())
+    return (await job.status()).value
+
+
+async def write_report_task(ctx, research_request: dict, research_id: str) -> dict:
+    """arq worker function wrapping write_report."""
+    from backend.server.server import ResearchRequest, write_report
+
+    return await write_report(ResearchRequest(**research_request), research_id)
+
+
+if HAS_ARQ:
+    class WorkerSettings:
+        """Settings for the report worker, see the "Background reports" docs for how to run it."""
+        functions = [write_report_task]
+        job_timeout = REPORT_JOB_TIMEOUT
+        redis_settings = RedisSettings.from_dsn(REDIS_URL) if REDIS_URL else RedisSettings()
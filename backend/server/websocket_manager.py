@@ -1,6 +1,7 @@
 import asyncio
 import datetime
-from typing import Dict, List
+from contextlib import asynccontextmanager
+from typing import Dict
 
 from fastapi import WebSocket
 
@@ -18,7 +19,8 @@ class WebSocketManager:
 
     def __init__(self):
         """Initialize the WebSocketManager class."""
-        self.active_connections: List[WebSocket] = []
+        # Used as an ordered set so the oldest connection comes first
+        self.active_connections: Dict[WebSocket, None] = {}
         self.sender_tasks: Dict[WebSocket, asyncio.Task] = {}
         self.message_queues: Dict[WebSocket, asyncio.Queue] = {}
         self.chat_agent = None
@@ -50,7 +52,7 @@ class WebSocketManager:
         """Connect a websocket."""
         try:
             await websocket.accept()
-            self.active_connections.append(websocket)
+            self.active_connections[websocket] = None
             self.message_queues[websocket] = asyncio.Queue()
             self.sender_tasks[websocket] = asyncio.create_task(
                 self.start_sender(websocket))
@@ -60,19 +62,29 @@ class WebSocketManager:
                 await self.disconnect(websocket)
 
     async def disconnect(self, websocket: WebSocket):
-        """Disconnect a websocket."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            if websocket in self.sender_tasks:
-                self.sender_tasks[websocket].cancel()
-                await self.message_queues[websocket].put(None)
-                del self.sender_tasks[websocket]
-            if websocket in self.message_queues:
-                del self.message_queues[websocket]
-            try:
-                await websocket.close()
-            except:
-                pass  # Connection might already be closed
+        """Disconnect a websocket. Safe to call more than once."""
+        if websocket not in self.active_connections:
+            return
+        self.active_connections.pop(websocket, None)
+        sender_task = self.sender_tasks.pop(websocket, None)
+        queue = self.message_queues.pop(websocket, None)
+        if sender_task:
+            sender_task.cancel()
+        if queue:
+            await queue.put(None)
+        try:
+            await websocket.close()
+        except:
+            pass  # Connection might already be closed
+
+    @asynccontextmanager
+    async def connection(self, websocket: WebSocket):
+        """Connect a websocket and disconnect it on every exit path."""
+        await self.connect(websocket)
+        try:
+            yield websocket
+        finally:
+            await self.disconnect(websocket)
 
     async def start_streaming(self, task, report_type, report_source, source_urls, document_urls, tone, websocket, headers=None, query_domains=[], mcp_enabled=False, mcp_strategy="fast", mcp_configs=[]):
         """Start streaming the output."""
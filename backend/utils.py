@@ -1,6 +1,55 @@
+import asyncio
+import multiprocessing
+import os
 import aiofiles
 import urllib
 import mistune
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+# Executor used for the CPU-bound docx/pdf rendering, None means the loop's default thread pool
+_render_executor: Executor | None = None
+_render_executor_factory: Callable[[], Executor] | None = None
+
+def create_render_pool() -> ProcessPoolExecutor:
+    """Process pool for rendering, started without fork so workers don't inherit the API process."""
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context(start_method),
+    )
+
+def set_render_executor(executor_factory: Callable[[], Executor] | None) -> None:
+    """Set the factory (e.g. create_render_pool) of the executor used to render docx and pdf files.
+
+    The factory is kept so a broken process pool can be replaced. Passing None shuts down
+    the current executor and goes back to the default thread pool.
+    """
+    global _render_executor, _render_executor_factory
+    previous = _render_executor
+    _render_executor_factory = executor_factory
+    _render_executor = executor_factory() if executor_factory else None
+    if previous is not None:
+        previous.shutdown(wait=False, cancel_futures=True)
+
+def _replace_broken_executor(broken: Executor) -> None:
+    global _render_executor
+    # Another render may already have replaced it
+    if _render_executor is not broken:
+        return
+    broken.shutdown(wait=False, cancel_futures=True)
+    _render_executor = _render_executor_factory() if _render_executor_factory else None
+
+async def _run_render(func, *args):
+    loop = asyncio.get_running_loop()
+    executor = _render_executor
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        print("Render process pool is broken, recreating it and rendering in a thread instead")
+        _replace_broken_executor(executor)
+        return await loop.run_in_executor(None, func, *args)
 
 async def write_to_file(filename: str, text: str) -> None:
     """Asynchronously write text to a file in UTF-8 encoding.
@@ -44,12 +93,8 @@ async def write_md_to_pdf(text: str, filename: str = "") -> str:
     file_path = f"outputs/{filename[:60]}.pdf"
 
     try:
-        from md2pdf.core import md2pdf
-        md2pdf(file_path,
-               md_content=text,
-               # md_file_path=f"{file_path}.md",
-               css_file_path="./frontend/pdf_styles.css",
-               base_url=None)
+        # md2pdf renders synchronously, run it off the event loop
+        await _run_render(_md_to_pdf, text, file_path)
         print(f"Report written to {file_path}")
     except Exception as e:
         print(f"Error in converting Markdown to PDF: {e}")
@@ -70,17 +115,8 @@ async def write_md_to_word(text: str, filename: str = "") -> str:
     file_path = f"outputs/{filename[:60]}.docx"
 
     try:
-        from docx import Document
-        from htmldocx import HtmlToDocx
-        # Convert report markdown to HTML
-        html = mistune.html(text)
-        # Create a document object
-        doc = Document()
-        # Convert the html generated from the report to document format
-        HtmlToDocx().add_html_to_document(html, doc)
-
-        # Saving the docx document to file_path
-        doc.save(file_path)
+        # The conversion is synchronous, run it off the event loop
+        await _run_render(_md_to_docx, text, file_path)
 
         print(f"Report written to {file_path}")
 
@@ -89,4 +125,25 @@ async def write_md_to_word(text: str, filename: str = "") -> str:
 
     except Exception as e:
         print(f"Error in converting Markdown to DOCX: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+def _md_to_pdf(text: str, file_path: str) -> None:
+    from md2pdf.core import md2pdf
+    md2pdf(file_path,
+           md_content=text,
+           # md_file_path=f"{file_path}.md",
+           css_file_path="./frontend/pdf_styles.css",
+           base_url=None)
+
+def _md_to_docx(text: str, file_path: str) -> None:
+    from docx import Document
+    from htmldocx import HtmlToDocx
+    # Convert report markdown to HTML
+    html = mistune.html(text)
+    # Create a document object
+    doc = Document()
+    # Convert the html generated from the report to document format
+    HtmlToDocx().add_html_to_document(html, doc)
+
+    # Saving the docx document to file_path
+    doc.save(file_path)
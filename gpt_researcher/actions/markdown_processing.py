@@ -1,42 +1,115 @@
+import io
 import re
-import markdown
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
-def extract_headers(markdown_text: str) -> List[Dict]:
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_FENCE_RE = re.compile(r' {0,3}(`{3,}|~{3,})(.*)$')
+# Only real HTML tags, so bare '<' in prose and <scheme://...> autolinks are kept
+_TAG_RE = re.compile(r'</?[A-Za-z][A-Za-z0-9-]*(?:\s[^<>]*)?/?>')
+
+def _parse_header(line: str) -> Optional[Tuple[int, str]]:
     """
-    Extract headers from markdown text.
+    Parse an ATX-style markdown header line.
 
     Args:
-        markdown_text (str): The markdown text to process.
+        line (str): A single line of markdown text.
 
     Returns:
-        List[Dict]: A list of dictionaries representing the header structure.
+        Optional[Tuple[int, str]]: The header level and text, or None if the line is not a header.
     """
-    headers = []
-    parsed_md = markdown.markdown(markdown_text)
-    lines = parsed_md.split("\n")
+    stripped = line.lstrip(" ")
+    # Four or more leading spaces make an indented code block, not a header
+    if len(line) - len(stripped) > 3 or not stripped.startswith("#"):
+        return None
+
+    level = len(stripped) - len(stripped.lstrip("#"))
+    if level > 6:
+        return None
 
+    text = stripped[level:].strip().rstrip("#").strip()
+    return level, text
+
+def _iter_lines(markdown_text: str):
+    """
+    Yield markdown lines along with whether they are inside a fenced code block.
+    """
+    fence = None  # (character, run length) of the fence that opened the current block
+    for line in markdown_text.splitlines():
+        match = _FENCE_RE.match(line)
+        if fence is None:
+            if match:
+                fence = (match.group(1)[0], len(match.group(1)))
+                yield line, True
+            else:
+                yield line, False
+            continue
+
+        # Only a fence of the same character, at least as long and without an info string, closes the block
+        if (
+            match
+            and match.group(1)[0] == fence[0]
+            and len(match.group(1)) >= fence[1]
+            and not match.group(2).strip()
+        ):
+            fence = None
+        yield line, True
+
+@lru_cache(maxsize=128)
+def _extract_header_tree(markdown_text: str) -> Tuple:
+    """
+    Parse the header structure of markdown text into nested (level, text, children) tuples.
+
+    Cached since the same report is parsed several times, and immutable so cached
+    results can't be mutated by callers.
+    """
+    headers = []
     stack = []
-    for line in lines:
-        if line.startswith("<h") and len(line) > 2 and line[2].isdigit():
-            level = int(line[2])
-            header_text = line[line.index(">") + 1 : line.rindex("<")]
+    for line, in_code in _iter_lines(markdown_text):
+        parsed = None if in_code else _parse_header(line)
+        if not parsed:
+            continue
+        level, header_text = parsed
+
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+
+        header = (level, header_text, [])
+        if stack:
+            stack[-1][2].append(header)
+        else:
+            headers.append(header)
 
-            while stack and stack[-1]["level"] >= level:
-                stack.pop()
+        stack.append(header)
 
+    def freeze(nodes):
+        return tuple((level, text, freeze(children)) for level, text, children in nodes)
+
+    return freeze(headers)
+
+def extract_headers(markdown_text: str) -> List[Dict]:
+    """
+    Extract headers from markdown text.
+
+    Args:
+        markdown_text (str): The markdown text to process.
+
+    Returns:
+        List[Dict]: A list of dictionaries representing the header structure.
+    """
+    def to_dicts(nodes):
+        headers = []
+        for level, text, children in nodes:
             header = {
                 "level": level,
-                "text": header_text,
+                "text": text,
             }
-            if stack:
-                stack[-1].setdefault("children", []).append(header)
-            else:
-                headers.append(header)
+            if children:
+                header["children"] = to_dicts(children)
+            headers.append(header)
+        return headers
 
-            stack.append(header)
-
-    return headers
+    return to_dicts(_extract_header_tree(markdown_text))
 
 def extract_sections(markdown_text: str) -> List[Dict[str, str]]:
     """
@@ -50,24 +123,42 @@ def extract_sections(markdown_text: str) -> List[Dict[str, str]]:
         'section_title' and 'written_content'.
     """
     sections = []
-    parsed_md = markdown.markdown(markdown_text)
-    
-    pattern = r'<h\d>(.*?)</h\d>(.*?)(?=<h\d>|$)'
-    matches = re.findall(pattern, parsed_md, re.DOTALL)
-    
-    for title, content in matches:
-        clean_content = re.sub(r'<.*?>', '', content).strip()
+    title = None
+    content = []
+
+    def flush():
+        if title is None:
+            return
+        section_text = "\n".join(content)
+        # Plain prose has no tags, skip the regex entirely
+        if "<" in section_text:
+            section_text = _TAG_RE.sub('', section_text)
+        clean_content = section_text.strip()
         if clean_content:
             sections.append({
-                "section_title": title.strip(),
+                "section_title": title,
                 "written_content": clean_content
             })
-    
+
+    for line, in_code in _iter_lines(markdown_text):
+        parsed = None if in_code else _parse_header(line)
+        if parsed:
+            flush()
+            title = parsed[1]
+            content = []
+        else:
+            content.append(line)
+    flush()
+
     return sections
 
 def contains_chinese(text: str) -> bool:
-    return bool(re.search(r'[\u4e00-\u9fff]', text))
+    # str.isascii is a constant-time flag check on CPython strings
+    if text.isascii():
+        return False
+    return bool(_CJK_RE.search(text))
 
+@lru_cache(maxsize=128)
 def table_of_contents(markdown_text: str) -> str:
     headers = extract_headers(markdown_text)
     first_header_text = headers[0]["text"] if headers else ""
@@ -75,19 +166,26 @@ def table_of_contents(markdown_text: str) -> str:
 
     toc_title = "## 目录\n\n" if is_chinese else "## Table of Contents\n\n"
 
-    def generate_table_of_contents(headers, indent_level=0):
-        toc = ""
-        for header in headers:
-            toc += " " * (indent_level * 4) + "- " + header["text"] + "\n"
-            if "children" in header:
-                toc += generate_table_of_contents(header["children"], indent_level + 1)
-        return toc
-
-    toc = toc_title + generate_table_of_contents(headers)
+    buf = io.StringIO()
+    buf.write(toc_title)
+    # Depth-first walk with an explicit stack, children pushed in reverse to keep order
+    stack = [(header, 0) for header in reversed(headers)]
+    while stack:
+        header, indent_level = stack.pop()
+        buf.write(" " * (indent_level * 4))
+        buf.write("- ")
+        buf.write(header["text"])
+        buf.write("\n")
+        stack.extend((child, indent_level + 1) for child in reversed(header.get("children", [])))
+
+    toc = buf.getvalue()
     return toc, is_chinese 
 
 def add_references(report_markdown: str, visited_urls: set, is_chinese: bool) -> str:
     references_title = "## 参考资料" if is_chinese else "## References"
+    # Sort so the references are deterministic across runs
+    lines = [f"- [{url}]({url})" for url in sorted(visited_urls)]
     url_markdown = f"\n\n\n{references_title}\n\n"
-    url_markdown += "".join(f"- [{url}]({url})\n" for url in visited_urls)
-    return report_markdown + url_markdown
\ No newline at end of file
+    if lines:
+        url_markdown += "\n".join(lines) + "\n"
+    return report_markdown + url_markdown
@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+DEFAULT_CACHE_PATH = os.getenv("MULTI_AGENTS_CACHE_PATH", os.path.join("data", "llm_cache.json"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("MULTI_AGENTS_CACHE_MAX_ENTRIES", 256))
+
+
+def cache_key(*parts: Any) -> str:
+    """Build a stable sha256 key from JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JSONFileCache:
+    """Minimal persistent key/value cache stored in a single JSON file."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: dict | None = None
+        self._write_lock = asyncio.Lock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def _prune(self) -> None:
+        """Drop expired entries, then the oldest ones beyond max_entries."""
+        now = time.time()
+        for key in [
+            key for key, entry in self._entries.items()
+            if entry.get("expires_at") is not None and entry["expires_at"] <= now
+        ]:
+            del self._entries[key]
+        # The first keys are the oldest
+        for key in list(self._entries)[:max(len(self._entries) - self.max_entries, 0)]:
+            del self._entries[key]
+
+    async def _save(self) -> None:
+        # Prune and serialize on the event loop so the entries aren't mutated mid-dump,
+        # only the file write happens in a thread
+        self._prune()
+        payload = json.dumps(self._entries, ensure_ascii=False)
+        async with self._write_lock:
+            await asyncio.to_thread(self._write, payload)
+
+    def _write(self, payload: str) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            await self._save()
+            return None
+        return entry.get("value")
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        entries = self._load()
+        # Re-insert so the dict order stays oldest-first for eviction
+        entries.pop(key, None)
+        entries[key] = {
+            "value": value,
+            "expires_at": time.time() + ttl if ttl is not None else None,
+        }
+        await self._save()
@@ -1,7 +1,9 @@
 from datetime import datetime
-import json5 as json
+import hashlib
+import orjson
 from .utils.views import print_agent_output
 from .utils.llms import call_model
+from .utils.cache import JSONFileCache, cache_key
 
 sample_json = """
 {
@@ -12,6 +14,10 @@ sample_json = """
 }
 """
 
+LAYOUT_CACHE_TTL = 60 * 60
+
+layout_cache = JSONFileCache()
+
 
 class WriterAgent:
     def __init__(self, websocket=None, stream_output=None, headers=None):
@@ -36,6 +42,26 @@ class WriterAgent:
         follow_guidelines = task.get("follow_guidelines")
         guidelines = task.get("guidelines")
 
+        # Serialize research data once with orjson, much cheaper than str() on large nested data
+        try:
+            data_bytes = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Keys orjson can't serialize even with OPT_NON_STR_KEYS, e.g. tuples
+            data_bytes = str(data).encode()
+        data_str = data_bytes.decode()
+
+        # The layout's introduction, conclusion and references are written from the
+        # research data, so it is part of the key
+        use_cache = task.get("cache", True)
+        layout_key = cache_key(
+            task.get("model"), query, follow_guidelines, guidelines,
+            hashlib.sha256(data_bytes).hexdigest()
+        )
+        if use_cache:
+            cached_layout = await layout_cache.get(layout_key)
+            if cached_layout is not None:
+                return cached_layout
+
         prompt = [
             {
                 "role": "system",
@@ -45,7 +71,7 @@ class WriterAgent:
                 "role": "user",
                 "content": f"""今天的日期是：{datetime.now().strftime('%Y年%m月%d日')}
 研究主题：{query}
-研究数据如下：{str(data)}
+研究数据如下：{data_str}
 
 请你根据以上研究数据完成以下任务：
 1. 用中文撰写一段详细的引言（不需要加标题）。
@@ -66,6 +92,8 @@ class WriterAgent:
             task.get("model"),
             response_format="json",
         )
+        if use_cache and response is not None:
+            await layout_cache.set(layout_key, response, ttl=LAYOUT_CACHE_TTL)
         return response
 
     async def revise_headers(self, task: dict, headers: dict):
@@ -115,9 +143,9 @@ class WriterAgent:
 
         if research_state.get("task").get("verbose"):
             if self.websocket and self.stream_output:
-                research_layout_content_str = json.dumps(
-                    research_layout_content, indent=2
-                )
+                research_layout_content_str = orjson.dumps(
+                    research_layout_content, option=orjson.OPT_INDENT_2, default=str
+                ).decode()
                 await self.stream_output(
                     "logs",
                     "research_layout_content",
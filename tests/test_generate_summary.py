@@ -0,0 +1,119 @@
+import os
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.server import server
+from backend.server.report_cache import ReportCache
+
+
+class FakeResearcher:
+    instances = []
+
+    def __init__(self, query, websocket=None, context=None, visited_urls=None, **kwargs):
+        self.query = query
+        self.websocket = websocket
+        self.context = context or []
+        self.visited_urls = visited_urls or set()
+        self.agent = self.role = None
+        self.research_sources = self.research_images = []
+        self.costs = 0.0
+        self.researched = self.written = False
+        FakeResearcher.instances.append(self)
+
+    async def conduct_research(self):
+        self.researched = True
+        self.context = ["shared context"]
+        self.costs = 1.0
+
+    async def write_report(self):
+        self.written = True
+        self.costs += 0.1
+        return f"Report from {self.context}"
+
+    def add_costs(self, costs):
+        self.costs += costs
+
+    def get_costs(self):
+        return self.costs
+
+    def get_source_urls(self):
+        return []
+
+    def get_research_images(self):
+        return []
+
+
+async def _write_file(report, research_id, extension):
+    path = f"outputs/{research_id}.{extension}"
+    with open(path, "w") as f:
+        f.write(report)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def fake_research(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("outputs")
+    FakeResearcher.instances = []
+    monkeypatch.setattr(server, "GPTResearcher", FakeResearcher)
+    monkeypatch.setattr(server, "report_cache", ReportCache(similarity_threshold=None))
+    monkeypatch.setattr(server, "write_md_to_word", lambda report, research_id: _write_file(report, research_id, "docx"))
+    monkeypatch.setattr(server, "write_md_to_pdf", lambda report, research_id: _write_file(report, research_id, "pdf"))
+
+
+def _summary_request():
+    return server.SummaryRequest(name="Dune", author="Frank Herbert", publication_date="1965")
+
+
+def _costs(result):
+    return result["research_information"]["research_costs"]
+
+
+def _counts():
+    researched = sum(researcher.researched for researcher in FakeResearcher.instances)
+    written = sum(researcher.written for researcher in FakeResearcher.instances)
+    return researched, written
+
+
+@pytest.mark.asyncio
+async def test_summary_researches_once_and_charges_it_once():
+    response = await server.generate_summary(_summary_request())
+
+    assert _counts() == (1, 2)
+    assert response["summary_chinese"] == response["summary_english"] == "Report from ['shared context']"
+    costs = sorted(_costs(entry["response"]) for entry in server.report_cache._entries.values())
+    assert costs == [pytest.approx(0.1), pytest.approx(1.1)]
+
+
+@pytest.mark.asyncio
+async def test_summary_skips_research_when_both_reports_are_cached():
+    await server.generate_summary(_summary_request())
+    FakeResearcher.instances = []
+
+    response = await server.generate_summary(_summary_request())
+
+    assert _counts() == (0, 0)
+    assert response["summary_chinese"] == response["summary_english"] == "Report from ['shared context']"
+
+
+@pytest.mark.asyncio
+async def test_summary_only_writes_the_report_that_missed_the_cache(monkeypatch):
+    english_task = server._ENGLISH_TEMPLATE.format(**_summary_request().model_dump())
+    await server.generate_summary(_summary_request())
+    # Drop the English report from the cache
+    for key, entry in list(server.report_cache._entries.items()):
+        if entry["response"]["research_id"].startswith("summary_en"):
+            del server.report_cache._entries[key]
+    FakeResearcher.instances = []
+    cache_get = AsyncMock(wraps=server.report_cache.get)
+    monkeypatch.setattr(server.report_cache, "get", cache_get)
+
+    response = await server.generate_summary(_summary_request())
+
+    assert _counts() == (1, 1)
+    # The cached Chinese report is looked up, and its files copied, only once
+    assert cache_get.await_count == 2
+    [written] = [researcher for researcher in FakeResearcher.instances if researcher.written]
+    assert written.query == english_task
+    assert written.costs == pytest.approx(1.1)
+    assert response["summary_chinese"] == "Report from ['shared context']"
@@ -0,0 +1,119 @@
+from gpt_researcher.actions.markdown_processing import (
+    add_references,
+    extract_headers,
+    extract_sections,
+    table_of_contents,
+)
+
+REPORT = """# Report Title
+
+Intro paragraph.
+
+## First Section
+Some **bold** text.
+- item one
+
+### Sub Section
+Details here.
+
+```python
+# not a header
+```
+
+## Second Section ##
+Closing words.
+"""
+
+
+def test_extract_headers_builds_nested_structure():
+    headers = extract_headers(REPORT)
+
+    assert len(headers) == 1
+    assert headers[0]["level"] == 1
+    assert headers[0]["text"] == "Report Title"
+
+    children = headers[0]["children"]
+    assert [child["text"] for child in children] == ["First Section", "Second Section"]
+    assert children[0]["children"] == [{"level": 3, "text": "Sub Section"}]
+
+
+def test_extract_headers_returns_fresh_results_from_cache():
+    first = extract_headers(REPORT)
+    first[0]["children"].clear()
+
+    assert len(extract_headers(REPORT)[0]["children"]) == 2
+
+
+def test_extract_headers_ignores_non_headers():
+    assert extract_headers("plain text\n    # indented code\n####### too deep") == []
+
+
+def test_extract_sections_collects_content_between_headers():
+    sections = extract_sections(REPORT)
+
+    assert [section["section_title"] for section in sections] == [
+        "Report Title",
+        "First Section",
+        "Sub Section",
+        "Second Section",
+    ]
+    assert sections[0]["written_content"] == "Intro paragraph."
+    assert "Some **bold** text." in sections[1]["written_content"]
+    assert "# not a header" in sections[2]["written_content"]
+    assert sections[3]["written_content"] == "Closing words."
+
+
+def test_extract_sections_skips_empty_sections():
+    sections = extract_sections("# Title\n\n## Empty\n\n## Filled\nText")
+
+    assert sections == [{"section_title": "Filled", "written_content": "Text"}]
+
+
+def test_extract_sections_strips_inline_html():
+    sections = extract_sections("## Title\nLine one<br>line two <b>bold</b>")
+
+    assert sections[0]["written_content"] == "Line oneline two bold"
+
+
+def test_extract_sections_keeps_comparisons_in_prose():
+    sections = extract_sections("## Results\nLatency dropped when n < 5 and rose when n > 20.")
+
+    assert sections[0]["written_content"] == "Latency dropped when n < 5 and rose when n > 20."
+
+
+def test_extract_sections_keeps_autolinks():
+    sections = extract_sections("## Results\nSee <https://example.com/paper> for details.")
+
+    assert sections[0]["written_content"] == "See <https://example.com/paper> for details."
+
+
+def test_extract_sections_only_closes_fence_with_matching_fence():
+    sections = extract_sections("# A\ntext\n~~~\n```\n# inside\n~~~\n# B\nmore")
+
+    assert [section["section_title"] for section in sections] == ["A", "B"]
+    assert "# inside" in sections[0]["written_content"]
+    assert sections[1]["written_content"] == "more"
+
+
+def test_table_of_contents_indents_nested_headers():
+    toc, is_chinese = table_of_contents(REPORT)
+
+    assert not is_chinese
+    assert toc == (
+        "## Table of Contents\n\n"
+        "- Report Title\n"
+        "    - First Section\n"
+        "        - Sub Section\n"
+        "    - Second Section\n"
+    )
+
+
+def test_add_references_lists_urls_in_sorted_order():
+    urls = {"https://b.example", "https://a.example"}
+
+    assert add_references("Body", urls, is_chinese=False) == (
+        "Body\n\n\n## References\n\n"
+        "- [https://a.example](https://a.example)\n"
+        "- [https://b.example](https://b.example)\n"
+    )
+    assert add_references("正文", set(), is_chinese=True) == "正文\n\n\n## 参考资料\n\n"
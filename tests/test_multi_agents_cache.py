@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from multi_agents.agents import writer
+from multi_agents.agents.utils.cache import JSONFileCache
+
+
+@pytest.mark.asyncio
+async def test_json_file_cache_round_trip(tmp_path):
+    path = tmp_path / "llm_cache.json"
+    await JSONFileCache(str(path)).set("key", {"引言": "intro"}, ttl=60)
+
+    assert await JSONFileCache(str(path)).get("key") == {"引言": "intro"}
+
+
+@pytest.mark.asyncio
+async def test_json_file_cache_expires_entries(tmp_path):
+    cache = JSONFileCache(str(tmp_path / "llm_cache.json"))
+    await cache.set("expired", "value", ttl=-1)
+    await cache.set("fresh", "value", ttl=60)
+
+    assert await cache.get("expired") is None
+    # Expired entries are pruned from the file on the next write
+    assert "expired" not in JSONFileCache(cache.path)._load()
+
+
+@pytest.mark.asyncio
+async def test_json_file_cache_evicts_oldest_entries(tmp_path):
+    cache = JSONFileCache(str(tmp_path / "llm_cache.json"), max_entries=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.set("a", 3)
+    await cache.set("c", 4)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 3
+    assert await cache.get("c") == 4
+
+
+def _research_state(cache=True):
+    return {
+        "title": "Is AI in a hype cycle?",
+        "research_data": [{"Section": "content"}],
+        "task": {"model": "gpt-4o", "follow_guidelines": False, "cache": cache},
+    }
+
+
+@pytest.mark.asyncio
+async def test_write_sections_reuses_cached_layout(tmp_path, monkeypatch):
+    call_model = AsyncMock(return_value={"引言": "intro"})
+    monkeypatch.setattr(writer, "call_model", call_model)
+    monkeypatch.setattr(writer, "layout_cache", JSONFileCache(str(tmp_path / "llm_cache.json")))
+
+    agent = writer.WriterAgent()
+    assert await agent.write_sections(_research_state()) == {"引言": "intro"}
+    assert await agent.write_sections(_research_state()) == {"引言": "intro"}
+    assert call_model.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_write_sections_cache_opt_out(tmp_path, monkeypatch):
+    call_model = AsyncMock(return_value={"引言": "intro"})
+    layout_cache = JSONFileCache(str(tmp_path / "llm_cache.json"))
+    monkeypatch.setattr(writer, "call_model", call_model)
+    monkeypatch.setattr(writer, "layout_cache", layout_cache)
+
+    agent = writer.WriterAgent()
+    await agent.write_sections(_research_state(cache=False))
+    await agent.write_sections(_research_state(cache=False))
+
+    assert call_model.await_count == 2
+    assert layout_cache._load() == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("research_data", [
+    [{1: "int key", None: "null key"}],
+    [{("Section", 1): "tuple key"}],
+])
+async def test_write_sections_accepts_non_str_keys(tmp_path, monkeypatch, research_data):
+    call_model = AsyncMock(return_value={"引言": "intro"})
+    monkeypatch.setattr(writer, "call_model", call_model)
+    monkeypatch.setattr(writer, "layout_cache", JSONFileCache(str(tmp_path / "llm_cache.json")))
+
+    state = {**_research_state(), "research_data": research_data}
+    assert await writer.WriterAgent().write_sections(state) == {"引言": "intro"}
+    prompt = call_model.await_args.args[0][1]["content"]
+    assert list(research_data[0].values())[0] in prompt
@@ -0,0 +1,25 @@
+import pytest
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend import utils
+
+
+class BrokenExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+
+@pytest.mark.asyncio
+async def test_broken_render_pool_falls_back_and_is_replaced():
+    executors = [BrokenExecutor(), ThreadPoolExecutor(max_workers=1)]
+    utils.set_render_executor(lambda: executors.pop(0))
+    try:
+        # The failing call still renders, on the default thread pool
+        assert await utils._run_render(str.upper, "report") == "REPORT"
+        assert isinstance(utils._render_executor, ThreadPoolExecutor)
+        assert await utils._run_render(str.upper, "next") == "NEXT"
+    finally:
+        utils.set_render_executor(None)
+
+    assert utils._render_executor is None
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import pytest
+from types import SimpleNamespace
+
+from backend.server.report_cache import ReportCache
+
+
+def _request(task="What is GPT Researcher?", headers=None):
+    return SimpleNamespace(
+        task=task,
+        report_type="research_report",
+        report_source="web",
+        tone="Objective",
+        language=None,
+        headers=headers,
+    )
+
+
+def _response(research_id):
+    with open(f"outputs/{research_id}.docx", "w") as f:
+        f.write("docx")
+    with open(f"outputs/{research_id}.pdf", "w") as f:
+        f.write("pdf")
+    return {
+        "research_id": research_id,
+        "research_information": {"research_costs": 0.42},
+        "report": f"Report {research_id}",
+        "docx_path": f"outputs/{research_id}.docx",
+        "pdf_path": f"outputs/{research_id}.pdf",
+    }
+
+
+@pytest.fixture(autouse=True)
+def outputs_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("outputs")
+
+
+@pytest.mark.asyncio
+async def test_exact_hit_reissues_files_under_new_research_id():
+    cache = ReportCache(similarity_threshold=None)
+    await cache.set(_request(), _response("first"))
+
+    response = await cache.get(_request(), "second")
+
+    assert response["research_id"] == "second"
+    assert response["report"] == "Report first"
+    assert response["cached"] is True
+    assert response["research_information"]["research_costs"] == 0.0
+    assert response["docx_path"] == "outputs/second.docx"
+    assert response["pdf_path"] == "outputs/second.pdf"
+    with open("outputs/second.docx") as f:
+        assert f.read() == "docx"
+
+
+@pytest.mark.asyncio
+async def test_headers_are_part_of_the_key():
+    cache = ReportCache(similarity_threshold=None)
+    await cache.set(_request(headers={"retriever": "tavily"}), _response("first"))
+
+    assert await cache.get(_request(headers={"retriever": "bing"}), "second") is None
+    assert await cache.get(_request(headers={"retriever": "tavily"}), "second") is not None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_miss():
+    cache = ReportCache(ttl=-1, similarity_threshold=None)
+    await cache.set(_request(), _response("first"))
+
+    assert await cache.get(_request(), "second") is None
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = ReportCache(max_entries=2, similarity_threshold=None)
+    await cache.set(_request("a"), _response("a"))
+    await cache.set(_request("b"), _response("b"))
+    # Touch "a" so "b" becomes the least recently used
+    assert await cache.get(_request("a"), "a2") is not None
+    await cache.set(_request("c"), _response("c"))
+
+    assert await cache.get(_request("b"), "b2") is None
+    assert await cache.get(_request("a"), "a3") is not None
+    assert await cache.get(_request("c"), "c2") is not None
+
+
+@pytest.mark.asyncio
+async def test_entry_with_missing_artifact_is_evicted():
+    cache = ReportCache(similarity_threshold=None)
+    await cache.set(_request(), _response("first"))
+    os.remove("outputs/first.pdf")
+
+    assert await cache.get(_request(), "second") is None
+    assert len(cache._entries) == 0
+
+
+@pytest.mark.asyncio
+async def test_hit_survives_eviction_during_copy(monkeypatch):
+    cache = ReportCache(max_entries=1, similarity_threshold=None)
+    await cache.set(_request("a"), _response("a"))
+    copy_started, evicted = asyncio.Event(), asyncio.Event()
+
+    async def to_thread(func, *args):
+        copy_started.set()
+        await evicted.wait()
+        return func(*args)
+
+    monkeypatch.setattr(asyncio, "to_thread", to_thread)
+
+    async def evict():
+        await copy_started.wait()
+        await cache.set(_request("b"), _response("b"))
+        evicted.set()
+
+    response, _ = await asyncio.gather(cache.get(_request("a"), "a2"), evict())
+
+    assert response["report"] == "Report a"
+    assert list(cache._entries) == [ReportCache.cache_key(_request("b"))]
@@ -0,0 +1,41 @@
+import os
+import pytest
+from types import SimpleNamespace
+
+from backend.server import server
+from backend.server.server_utils import etag_matches
+
+
+ETAG = '"17f-2a"'
+
+
+@pytest.mark.parametrize("if_none_match", [
+    '"17f-2a"',
+    'W/"17f-2a"',
+    '"other", "17f-2a"',
+    '"other",W/"17f-2a"',
+    "*",
+])
+def test_etag_matches(if_none_match):
+    assert etag_matches(if_none_match, ETAG)
+
+
+@pytest.mark.parametrize("if_none_match", [None, "", '"other"', '"17f-2a-stale"', "17f-2a"])
+def test_etag_does_not_match(if_none_match):
+    assert not etag_matches(if_none_match, ETAG)
+
+
+@pytest.mark.asyncio
+async def test_read_report_revalidates_with_304(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("outputs")
+    with open("outputs/report.docx", "w") as f:
+        f.write("docx")
+
+    response = await server.read_report(SimpleNamespace(headers={}), "report")
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+
+    response = await server.read_report(SimpleNamespace(headers={"if-none-match": f'"stale", W/{etag}'}), "report")
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
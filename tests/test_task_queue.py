@@ -0,0 +1,77 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from backend.server import server, task_queue
+
+
+def _request():
+    return server.ResearchRequest(
+        task="What is GPT Researcher?",
+        report_type="research_report",
+        report_source="web",
+        tone="Objective",
+        repo_name="gpt-researcher",
+        branch_name="main",
+    )
+
+
+def test_queue_requires_arq_and_redis_url(monkeypatch):
+    monkeypatch.setattr(task_queue, "HAS_ARQ", True)
+    monkeypatch.setattr(task_queue, "REDIS_URL", None)
+    assert not task_queue.queue_enabled()
+
+    monkeypatch.setattr(task_queue, "REDIS_URL", "redis://localhost:6379")
+    assert task_queue.queue_enabled()
+
+    monkeypatch.setattr(task_queue, "HAS_ARQ", False)
+    assert not task_queue.queue_enabled()
+
+
+@pytest.mark.asyncio
+async def test_background_report_is_enqueued_when_queue_enabled(monkeypatch):
+    enqueue_report = AsyncMock()
+    monkeypatch.setattr(server, "queue_enabled", lambda: True)
+    monkeypatch.setattr(server, "enqueue_report", enqueue_report)
+    background_tasks = Mock()
+
+    response = await server.generate_report(_request(), background_tasks)
+
+    enqueue_report.assert_awaited_once_with(_request().model_dump(), response["research_id"])
+    background_tasks.add_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_background_report_runs_in_process_when_queue_disabled(monkeypatch):
+    enqueue_report = AsyncMock()
+    monkeypatch.setattr(server, "queue_enabled", lambda: False)
+    monkeypatch.setattr(server, "enqueue_report", enqueue_report)
+    background_tasks = Mock()
+
+    response = await server.generate_report(_request(), background_tasks)
+
+    enqueue_report.assert_not_awaited()
+    background_tasks.add_task.assert_called_once_with(
+        server.write_report, research_request=_request(), research_id=response["research_id"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_report_status_from_queue(monkeypatch):
+    monkeypatch.setattr(server, "queue_enabled", lambda: True)
+    monkeypatch.setattr(server, "get_report_status", AsyncMock(return_value="in_progress"))
+
+    assert await server.read_report_status("task_1") == {"research_id": "task_1", "status": "in_progress"}
+
+
+@pytest.mark.asyncio
+async def test_report_status_is_404_when_queue_disabled(monkeypatch):
+    get_report_status = AsyncMock()
+    monkeypatch.setattr(server, "queue_enabled", lambda: False)
+    monkeypatch.setattr(server, "get_report_status", get_report_status)
+
+    response = await server.read_report_status("task_1")
+
+    assert response.status_code == 404
+    assert json.loads(response.body) == {"message": "Report queue is not enabled."}
+    get_report_status.assert_not_awaited()
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.server import server_utils
+from backend.server.websocket_manager import WebSocketManager
+
+
+def _websocket(*messages):
+    """A websocket that sends messages, then stays silent."""
+    websocket = AsyncMock()
+
+    async def receive_text():
+        if messages_left:
+            return messages_left.pop(0)
+        await asyncio.Event().wait()
+
+    messages_left = list(messages)
+    websocket.receive_text.side_effect = receive_text
+    return websocket
+
+
+@pytest.mark.asyncio
+async def test_idle_connection_is_closed(monkeypatch):
+    monkeypatch.setattr(server_utils, "WS_IDLE_TIMEOUT", 0.01)
+
+    await asyncio.wait_for(
+        server_utils.handle_websocket_communication(_websocket(), WebSocketManager()), timeout=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout_waits_for_running_task(monkeypatch):
+    finished = asyncio.Event()
+
+    async def handle_start_command(websocket, data, manager):
+        await asyncio.sleep(0.05)
+        finished.set()
+
+    monkeypatch.setattr(server_utils, "WS_IDLE_TIMEOUT", 0.01)
+    monkeypatch.setattr(server_utils, "handle_start_command", handle_start_command)
+
+    await asyncio.wait_for(
+        server_utils.handle_websocket_communication(_websocket("start {}"), WebSocketManager()), timeout=1
+    )
+    assert finished.is_set()
+
+
+@pytest.mark.asyncio
+async def test_connection_disconnects_on_error():
+    manager = WebSocketManager()
+    websocket = AsyncMock()
+
+    with pytest.raises(RuntimeError):
+        async with manager.connection(websocket):
+            assert websocket in manager.active_connections
+            raise RuntimeError("client went away")
+
+    assert websocket not in manager.active_connections
+    assert websocket not in manager.sender_tasks
+    websocket.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_is_idempotent():
+    manager = WebSocketManager()
+    websocket = AsyncMock()
+    await manager.connect(websocket)
+
+    await manager.disconnect(websocket)
+    await manager.disconnect(websocket)
+
+    websocket.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_multi_agents_streams_to_oldest_connection(monkeypatch):
+    run_research_task = AsyncMock(return_value="report")
+    monkeypatch.setattr(server_utils, "run_research_task", run_research_task)
+    manager = WebSocketManager()
+    first, second = AsyncMock(), AsyncMock()
+    await manager.connect(first)
+    await manager.connect(second)
+
+    assert await server_utils.execute_multi_agents(manager) == {"report": "report"}
+    assert run_research_task.await_args.args[1] is first
+
+    await manager.disconnect(first)
+    await manager.disconnect(second)